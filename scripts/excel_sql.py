@@ -2,8 +2,8 @@
 """
 excel_sql.py — Query and edit live Excel files using SQL.
 
-Uses xlwings (Excel process bridge) + pandasql (in-memory SQL on DataFrames).
-Designed as a CLI helper for Claude Code / OpenClaw.
+Uses xlwings (Excel process bridge) + DuckDB (in-process SQL directly on
+DataFrames). Designed as a CLI helper for Claude Code / OpenClaw.
 
 Usage:
     python excel_sql.py attach [workbook_name]   # Attach to open Excel workbook
@@ -14,56 +14,145 @@ Usage:
     python excel_sql.py schema [sheet]             # Show column info for a sheet
 """
 
+import os
 import sys
 import json
 import re
+import sqlite3
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
+import duckdb
+import numpy as np
 import pandas as pd
-import pandasql as psql
 
 try:
     import xlwings as xw
 except ImportError:
     xw = None
 
+try:
+    from numba import vectorize as _nb_vectorize
+
+    @_nb_vectorize(["boolean(float64, float64)"], nopython=True, target="parallel")
+    def _neq_nan(a, b):
+        """JIT'd elementwise 'changed' test for numeric columns."""
+        return (a != b) and not (np.isnan(a) and np.isnan(b))
+except ImportError:
+    _neq_nan = None
+
 # ---------------------------------------------------------------------------
 # Global state (persisted in a temp JSON between calls)
 # ---------------------------------------------------------------------------
 STATE_FILE = Path.home() / ".excel_sql_state.json"
+CACHE_DIR = Path.home() / ".excel_sql_cache"
 
-_wb = None          # xlwings Workbook reference
-_frames = {}        # sheet_name -> DataFrame
-
+DEFAULT_HEADER_ROW = 3  # Default: row 3 is the header (rows 1-2 are type/meta info)
 
-def _save_state(wb_name: str, header_row: int = DEFAULT_HEADER_ROW):
+_wb = None          # xlwings Workbook reference
+_frames = {}        # sheet_name -> DataFrame, or None until lazily loaded
+_header_row = DEFAULT_HEADER_ROW  # header row of the current attach
+_conn = None        # persistent in-memory SQLite session for exec paths
+_synced = {}        # table name -> id() of the frame last pushed to _conn
+_duck = None        # persistent DuckDB session for query paths
+_registered = {}    # table name -> id() of the frame last registered on _duck
+
+_SQLITE_MAX_VARS = 30_000  # stay under SQLite's bound-variable limit per INSERT
+
+# Precompiled statement patterns for extracting the target table.
+# Tolerate leading whitespace/newlines and quoted/bracketed identifiers.
+_UPDATE_RE = re.compile(r"^\s*UPDATE\s+[\"'`\[]?(\w+)[\"'`\]]?\s+SET\s", re.IGNORECASE)
+_INSERT_RE = re.compile(r"^\s*INSERT\s+INTO\s+[\"'`\[]?(\w+)[\"'`\]]?", re.IGNORECASE)
+_DELETE_RE = re.compile(r"^\s*DELETE\s+FROM\s+[\"'`\[]?(\w+)[\"'`\]]?", re.IGNORECASE)
+
+# Table identifiers following FROM/JOIN/INTO/UPDATE — quoted or bare.
+_TABLE_REF_RE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE)\s+(?:[\"'`\[]([^\"'`\]]+)[\"'`\]]|(\w+))",
+    re.IGNORECASE)
+_TABLE_REF_CONT_RE = re.compile(
+    r"(?:\s+(?:AS\s+)?\w+)?\s*,\s*(?:[\"'`\[]([^\"'`\]]+)[\"'`\]]|(\w+))",
+    re.IGNORECASE)
+
+# Matches a plain VALUES insert: optional column list, then the rows.
+_INSERT_VALUES_RE = re.compile(
+    r"^\s*INSERT\s+INTO\s+[\"'`\[]?\w+[\"'`\]]?\s*(?:\(([^)]*)\))?\s*VALUES\s*(.+?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL)
+
+# Splits an UPDATE into target table, SET clause and optional WHERE clause.
+_UPDATE_SPLIT_RE = re.compile(
+    r"^\s*UPDATE\s+[\"'`\[]?(\w+)[\"'`\]]?\s+SET\s+(.*?)(?:\s+WHERE\s+(.*?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL)
+
+# Tokens understood by the pandas fast-path translator.
+_SQL_TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<str>'(?:[^']|'')*')|"
+    r"(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|"
+    r"(?P<ident>[A-Za-z_]\w*|\"[^\"]+\"|`[^`]+`|\[[^\]]+\])|"
+    r"(?P<op><=|>=|<>|!=|=|<|>|\(|\)|,|\+|\-|\*|/|%)"
+    r")")
+
+# A single SQL literal inside a VALUES row.
+_LITERAL_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<null>NULL)|"
+    r"(?P<num>[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|"
+    r"(?P<str>'(?:[^']|'')*')"
+    r")\s*",
+    re.IGNORECASE)
+
+
+def _save_state(wb_name: str, header_row: int = DEFAULT_HEADER_ROW,
+                wb_path: str | None = None, sheets: list | None = None):
     """Save minimal state so subsequent CLI calls can re-attach."""
-    STATE_FILE.write_text(json.dumps({"workbook": wb_name, "header_row": header_row}))
+    mtime = None
+    if wb_path:
+        try:
+            mtime = os.path.getmtime(wb_path)
+        except OSError:
+            wb_path = None
+    STATE_FILE.write_text(json.dumps({
+        "workbook": wb_name,
+        "header_row": header_row,
+        "path": wb_path,
+        "mtime": mtime,
+        "sheets": sheets or [],
+    }))
+    _read_state.cache_clear()
 
 
 def _load_state() -> dict:
     if STATE_FILE.exists():
-        return json.loads(STATE_FILE.read_text())
+        # Keyed on mtime so repeated calls skip the read + parse while the
+        # file is unchanged, but still pick up writes from other processes
+        return dict(_read_state(STATE_FILE.stat().st_mtime_ns))
     return {}
 
 
+@lru_cache(maxsize=1)
+def _read_state(mtime_ns: int) -> dict:
+    return json.loads(STATE_FILE.read_text())
+
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
 
-DEFAULT_HEADER_ROW = 3  # Default: row 3 is the header (rows 1-2 are type/meta info)
-
-
 def attach(workbook_name: str | None = None, header_row: int = DEFAULT_HEADER_ROW) -> str:
-    """Attach to an open Excel workbook and load all sheets.
+    """Attach to an open Excel workbook and record its sheets.
+
+    Sheet data is loaded lazily on first use (see _get_frame), so attaching
+    is near-instant regardless of workbook size.
 
     Args:
         workbook_name: Name of the workbook to attach to (or None for active workbook).
         header_row: 1-indexed row number to use as column headers (default: 3).
                     Rows before the header row are skipped.
     """
-    global _wb, _frames
+    global _wb, _header_row
 
     if xw is None:
         return "ERROR: xlwings not installed. Run: pip install xlwings"
@@ -80,29 +169,110 @@ def attach(workbook_name: str | None = None, header_row: int = DEFAULT_HEADER_RO
         return "ERROR: No active workbook found. Is Excel open?"
 
     _frames.clear()
-    for sheet in _wb.sheets:
-        name = sheet.name
-        # Read all data as raw values first (no header assumption)
-        raw = sheet.used_range.options(pd.DataFrame, header=False, index=False).value
-        if raw is None or raw.empty:
-            continue
+    _reset_sessions()
+    _header_row = header_row
+    for name in _wb.sheet_names:
+        _frames[name] = None  # loaded lazily on first use
 
-        # Use specified header_row (1-indexed → 0-indexed)
-        h = header_row - 1
-        if h >= len(raw):
-            continue
-
-        headers = [str(c).strip() if c is not None else f"col_{i}"
-                   for i, c in enumerate(raw.iloc[h])]
-        data = raw.iloc[h + 1:].copy()
-        data.columns = headers
-        data = data.reset_index(drop=True)
+    try:
+        wb_path = _wb.fullname
+    except Exception:
+        wb_path = None
+    _save_state(_wb.name, header_row, wb_path=wb_path, sheets=list(_frames))
+    return (f"Attached to '{_wb.name}' (header row={header_row}). "
+            f"Sheets: {', '.join(_frames)}")
+
+
+def _get_frame(name: str):
+    """Return the DataFrame for a sheet, reading it from Excel on first use."""
+    df = _frames.get(name)
+    if df is not None:
+        return df
+    if name not in _frames:
+        return None
+    # A cache-served process has no live workbook; attach for real rather
+    # than claiming a sheet that exists in the workbook doesn't
+    if _wb is None and not _reattach_from_state():
+        return None
+    if name not in _frames:
+        return None  # sheet no longer exists in the workbook
+    df = _load_sheet(_wb.sheets[name], _header_row)
+    if df is not None:
+        _frames[name] = df
+        _cache_frame(name, df)
+    return df
+
+
+def _load_sheet(sheet, header_row: int):
+    """Read one sheet into a DataFrame; None if empty or below the header row."""
+    with _excel_batch(_wb):
+        raw = _read_raw(sheet)
+    return _parse_sheet(raw, header_row) if raw is not None else None
+
+
+def _read_raw(sheet):
+    """COM read of a sheet's used range; None if the sheet is empty."""
+    used = sheet.used_range
+    # Skip empty sheets cheaply instead of paying for a full
+    # range read + DataFrame conversion
+    last = used.last_cell
+    if last.row == 1 and last.column == 1 and used.value is None:
+        return None
+
+    # Read all data as raw values first (no header assumption)
+    raw = used.options(pd.DataFrame, header=False, index=False).value
+    if raw is None or raw.empty:
+        return None
+    return raw
+
+
+def _parse_sheet(raw: pd.DataFrame, header_row: int):
+    """Split raw sheet values into headers + an Arrow-backed data frame."""
+    # Use specified header_row (1-indexed → 0-indexed)
+    h = header_row - 1
+    if h >= len(raw):
+        return None
+
+    fallback = pd.Series([f"col_{i}" for i in range(raw.shape[1])],
+                         index=raw.columns)
+    headers = raw.iloc[h].astype("string").str.strip().fillna(fallback).tolist()
+    # Slice without .copy() — pandas copies lazily only on mutation,
+    # so this avoids duplicating the sheet during the read
+    data = raw.iloc[h + 1:]
+    data.columns = headers
+    data = data.reset_index(drop=True)
+    # Arrow-backed dtypes let DuckDB scan the frames zero-copy
+    # instead of marshalling python objects per query
+    return data.convert_dtypes(dtype_backend="pyarrow")
+
+
+def _load_all_frames():
+    """Materialize every sheet that hasn't been loaded yet.
+
+    COM reads are issued sequentially — xlwings objects aren't safe to
+    share across threads — but the pandas parsing of each raw block runs
+    in a thread pool, so sheet conversion overlaps across sheets.
+    """
+    pending = [name for name, df in _frames.items() if df is None]
+    if not pending or _wb is None:
+        return
 
-        _frames[name] = data
+    raws = {}
+    with _excel_batch(_wb):
+        for name in pending:
+            raws[name] = _read_raw(_wb.sheets[name])
+    raws = {name: raw for name, raw in raws.items() if raw is not None}
+    if not raws:
+        return
 
-    _save_state(_wb.name, header_row)
-    sheets_info = ", ".join(f"{k} ({len(v)} rows)" for k, v in _frames.items())
-    return f"Attached to '{_wb.name}' (header row={header_row}). Sheets: {sheets_info}"
+    with ThreadPoolExecutor(max_workers=min(len(raws), os.cpu_count() or 4)) as pool:
+        futures = {name: pool.submit(_parse_sheet, raw, _header_row)
+                   for name, raw in raws.items()}
+    for name, future in futures.items():
+        df = future.result()
+        if df is not None:
+            _frames[name] = df
+            _cache_frame(name, df)
 
 
 def reload(header_row: int | None = None) -> str:
@@ -117,12 +287,20 @@ def reload(header_row: int | None = None) -> str:
 
 def list_sheets() -> str:
     """List loaded sheets and their row counts."""
-    _ensure_loaded()
+    _ensure_names_loaded()
     if not _frames:
         return "No sheets loaded. Run: attach [workbook]"
     lines = []
     for name, df in _frames.items():
-        lines.append(f"  {name}: {len(df)} rows, {len(df.columns)} columns")
+        if df is not None:
+            lines.append(f"  {name}: {len(df)} rows, {len(df.columns)} columns")
+        elif _wb is not None:
+            # Probe size from the used range without materializing the sheet
+            last = _wb.sheets[name].used_range.last_cell
+            rows = max(last.row - _header_row, 0)
+            lines.append(f"  {name}: ~{rows} rows, {last.column} columns (not loaded)")
+        else:
+            lines.append(f"  {name}: (not loaded)")
     return "Loaded sheets:\n" + "\n".join(lines)
 
 
@@ -132,7 +310,7 @@ def schema(sheet_name: str | None = None) -> str:
     targets = [sheet_name] if sheet_name else list(_frames.keys())
     lines = []
     for name in targets:
-        df = _frames.get(name)
+        df = _get_frame(name)
         if df is None:
             lines.append(f"{name}: NOT FOUND")
             continue
@@ -144,9 +322,9 @@ def schema(sheet_name: str | None = None) -> str:
 def query(sql: str) -> str:
     """Run a SELECT query and return results as formatted text."""
     _ensure_loaded()
-    env = _build_env()
+    con = _duck_conn(sql)
     try:
-        result = psql.sqldf(sql, env)
+        result = con.execute(sql).df()
     except Exception as e:
         return f"SQL ERROR: {e}"
 
@@ -165,7 +343,7 @@ def exec_sql(sql: str) -> str:
     - For UPDATE: run query to identify affected rows, apply changes, write back
     - For INSERT: append rows to DataFrame and write to Excel
     """
-    _ensure_loaded()
+    _ensure_loaded(write=True)
     sql_upper = sql.strip().upper()
 
     if sql_upper.startswith("UPDATE"):
@@ -185,119 +363,463 @@ def exec_sql(sql: str) -> str:
 def _handle_update(sql: str) -> str:
     """Handle UPDATE by re-querying and diffing."""
     # Extract table name: UPDATE <table> SET ...
-    m = re.match(r"UPDATE\s+[\"']?(\w+)[\"']?\s+SET\s+", sql, re.IGNORECASE)
+    m = _UPDATE_RE.match(sql)
     if not m:
         return "ERROR: Could not parse UPDATE statement."
     
     table = m.group(1)
-    df = _frames.get(table)
+    df = _get_frame(table)
     if df is None:
         return f"ERROR: Sheet '{table}' not found."
 
-    # Use pandasql with a trick: create a new version via SELECT
-    # We'll parse SET clause and WHERE clause to build the update
-    env = _build_env()
-    
+    # Fast path: a simple single-table UPDATE is evaluated directly on the
+    # DataFrame — no SQLite ingest at all on the common case
+    translated = _translate_update(sql, df)
+    if translated is not None:
+        result = _update_in_pandas(table, df, *translated)
+        if result is not None:
+            return result
+
     # Get the old data
     old_df = df.copy()
-    
-    # Execute via SQLite (pandasql uses SQLite under the hood)
-    # Create table, run update, read back
-    import sqlite3
-    conn = sqlite3.connect(":memory:")
-    
-    # Write all frames to SQLite
-    for name, frame in _frames.items():
-        frame.to_sql(name, conn, index=False, if_exists="replace")
-    
-    # Run the UPDATE
+
+    # Execute via SQLite: sync dirty frames, snapshot rowids, run update
+    conn = _sqlite_conn(sql)
     cursor = conn.cursor()
     try:
+        cursor.execute("DROP TABLE IF EXISTS _before")
+        cursor.execute(f'CREATE TEMP TABLE _before AS SELECT rowid AS _rid, * FROM "{table}"')
         cursor.execute(sql)
         affected = cursor.rowcount
         conn.commit()
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return f"SQL ERROR: {e}"
-    
-    # Read back the updated table
-    new_df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
-    conn.close()
-    
+
+    # Read back only the rows the UPDATE actually changed — not the whole
+    # table. Rowids from to_sql are 1-based in frame order, so _rid - 1 is
+    # the positional index into the DataFrame.
+    cols = list(df.columns)
+    col_list = ", ".join(f'a."{c}"' for c in cols)
+    diff_cond = " OR ".join(f'a."{c}" IS NOT b."{c}"' for c in cols)
+    changed_rows = pd.read_sql(
+        f'SELECT b._rid AS _rid, {col_list} FROM "{table}" a '
+        f'JOIN _before b ON a.rowid = b._rid WHERE {diff_cond}',
+        conn)
+
+    new_df = df.copy()
+    if not changed_rows.empty:
+        pos = changed_rows["_rid"].to_numpy() - 1
+        wanted = changed_rows[cols].to_numpy()
+        try:
+            new_df.iloc[pos] = wanted
+            # Arrow int columns coerce incoming floats silently instead
+            # of raising — verify the patch survived the assignment
+            patched = new_df.iloc[pos].to_numpy()
+            if not all(_values_equal(u, v)
+                       for u, v in zip(patched.ravel(), wanted.ravel())):
+                raise ValueError("lossy row patch")
+        except Exception:
+            # Dtype conflicts (e.g. strings into an all-null Arrow column)
+            # or lossy coercion — fall back to a full readback
+            new_df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
+
     # Diff and write changes to Excel
     changes = _diff_and_write(table, old_df, new_df)
     _frames[table] = new_df
-    
+    _synced[table] = id(new_df)
+    _registered.pop(table, None)
+    _cache_frame(table, new_df)
+
     return f"Updated {affected} row(s) in '{table}'. {changes} cell(s) written to Excel."
 
 
 def _handle_insert(sql: str) -> str:
     """Handle INSERT by executing in SQLite and appending to Excel."""
-    m = re.match(r"INSERT\s+INTO\s+[\"']?(\w+)[\"']?", sql, re.IGNORECASE)
+    m = _INSERT_RE.match(sql)
     if not m:
         return "ERROR: Could not parse INSERT statement."
     
     table = m.group(1)
-    df = _frames.get(table)
+    df = _get_frame(table)
     if df is None:
         return f"ERROR: Sheet '{table}' not found."
 
-    import sqlite3
-    conn = sqlite3.connect(":memory:")
-    for name, frame in _frames.items():
-        frame.to_sql(name, conn, index=False, if_exists="replace")
-    
+    # Fast path: a plain VALUES insert with literal values is applied
+    # directly to the DataFrame — no need to round-trip the whole
+    # workbook through SQLite just to append a few rows.
+    parsed = _parse_insert_values(sql)
+    if parsed is not None:
+        cols, rows = parsed
+        cols = cols if cols is not None else list(df.columns)
+        if all(c in df.columns for c in cols) and all(len(r) == len(cols) for r in rows):
+            new_rows = pd.DataFrame(rows, columns=cols).reindex(columns=df.columns)
+            new_df = pd.concat([df, new_rows], ignore_index=True)
+            _append_rows(table, df, new_df)
+            _frames[table] = new_df
+            # The old frame is gone and its id() may be recycled — drop
+            # the sync markers so the sessions re-push the new frame
+            _synced.pop(table, None)
+            _registered.pop(table, None)
+            _cache_frame(table, new_df)
+            return f"Inserted {len(rows)} row(s) into '{table}'."
+
+    # Fallback: INSERT ... SELECT and other complex forms go through SQLite
+    conn = _sqlite_conn(sql)
     cursor = conn.cursor()
     try:
         cursor.execute(sql)
         affected = cursor.rowcount
         conn.commit()
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return f"SQL ERROR: {e}"
-    
+
     new_df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
-    conn.close()
-    
+
     # Write new rows to Excel
     _append_rows(table, df, new_df)
     _frames[table] = new_df
-    
+    _synced[table] = id(new_df)
+    _registered.pop(table, None)
+    _cache_frame(table, new_df)
+
     return f"Inserted {affected} row(s) into '{table}'."
 
 
+def _parse_insert_values(sql: str):
+    """Parse a literal VALUES insert into (columns, rows).
+
+    Returns (column list or None, list of row tuples) when the statement
+    is a plain ``INSERT INTO t [(cols)] VALUES (...), (...)`` with only
+    NULL/number/string literals, or None for anything more complex
+    (expressions, functions, INSERT ... SELECT) so the caller can fall
+    back to SQLite.
+    """
+    m = _INSERT_VALUES_RE.match(sql)
+    if not m:
+        return None
+
+    cols = None
+    if m.group(1) is not None:
+        cols = [c.strip().strip("\"'`[]") for c in m.group(1).split(",")]
+
+    text = m.group(2)
+    rows = []
+    pos = 0
+    while True:
+        if pos >= len(text) or text[pos] != "(":
+            return None
+        pos += 1
+        row = []
+        while True:
+            lit = _LITERAL_RE.match(text, pos)
+            if not lit or lit.end() == pos:
+                return None
+            if lit.group("null") is not None:
+                row.append(None)
+            elif lit.group("num") is not None:
+                num = lit.group("num")
+                row.append(float(num) if any(c in num for c in ".eE") else int(num))
+            else:
+                row.append(lit.group("str")[1:-1].replace("''", "'"))
+            pos = lit.end()
+            if pos < len(text) and text[pos] == ",":
+                pos += 1
+                continue
+            break
+        if pos >= len(text) or text[pos] != ")":
+            return None
+        pos += 1
+        rows.append(tuple(row))
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos == len(text):
+            return cols, rows
+        if text[pos] != ",":
+            return None
+        pos += 1
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+
+
+def _update_in_pandas(table: str, df: pd.DataFrame, assignments, where) -> str | None:
+    """Apply a translated UPDATE directly to the frame.
+
+    Returns the result message, or None if evaluation/assignment fails
+    (e.g. dtype conflicts) so the caller can retry via SQLite.
+    """
+    new_df = df.copy()
+    try:
+        if where is not None:
+            mask = new_df.eval(where, engine="python")
+            mask = mask.fillna(False).astype(bool)
+        else:
+            mask = pd.Series(True, index=new_df.index)
+        # Evaluate every RHS against the pre-update frame before assigning,
+        # so SET a = b, b = a keeps SQL semantics
+        values = [df.eval(expr, engine="python") for _, expr in assignments]
+        for (col, _), val in zip(assignments, values):
+            rhs = val[mask] if isinstance(val, pd.Series) else val
+            if pd.api.types.is_integer_dtype(new_df[col].dtype):
+                # Arrow int columns truncate fractional values silently
+                # instead of raising; upcast so 7.5 stays 7.5 like SQLite
+                vals = rhs if isinstance(rhs, pd.Series) else pd.Series([rhs])
+                if (pd.api.types.is_float_dtype(vals.dtype)
+                        and not vals.dropna().mod(1).eq(0).all()):
+                    target = ("float64[pyarrow]"
+                              if isinstance(new_df[col].dtype, pd.ArrowDtype)
+                              else "float64")
+                    new_df[col] = new_df[col].astype(target)
+            new_df.loc[mask, col] = rhs
+        affected = int(mask.sum())
+    except Exception:
+        return None
+
+    changes = _diff_and_write(table, df, new_df)
+    _frames[table] = new_df
+    # The old frame is gone and its id() may be recycled — drop the sync
+    # markers so the sessions re-push the new frame
+    _synced.pop(table, None)
+    _registered.pop(table, None)
+    _cache_frame(table, new_df)
+    return f"Updated {affected} row(s) in '{table}'. {changes} cell(s) written to Excel."
+
+
+class _SqlExprTranslator:
+    """Translate a simple SQL expression subset into a pandas .eval() string.
+
+    Supports column references, string/number literals, arithmetic,
+    comparisons (= <> != < > <= >=) and AND/OR/NOT with parentheses.
+    Raises ValueError on anything else (functions, subqueries, IS NULL,
+    LIKE, IN, ...), which callers treat as "fall back to SQLite".
+
+    Expression methods return (eval_string, kind) where kind is "int",
+    "float" or "other". Division is only translated when a float operand
+    guarantees SQLite would do true division too — SQLite truncates
+    int / int while pandas does not, so that case falls back to SQLite.
+    """
+
+    def __init__(self, text: str, df: pd.DataFrame):
+        self.tokens = []
+        pos = 0
+        while pos < len(text):
+            m = _SQL_TOKEN_RE.match(text, pos)
+            if not m or m.end() == pos:
+                if text[pos:].strip():
+                    raise ValueError(f"Unrecognized token at: {text[pos:]!r}")
+                break
+            self.tokens.append((m.lastgroup, m.group(m.lastgroup)))
+            pos = m.end()
+        self.pos = 0
+        self.columns = set(df.columns)
+        self.dtypes = df.dtypes
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        kind, value = self.peek()
+        self.pos += 1
+        return kind, value
+
+    def expect_op(self, op: str):
+        kind, value = self.take()
+        if kind != "op" or value != op:
+            raise ValueError(f"Expected {op!r}, got {value!r}")
+
+    def at_keyword(self, word: str) -> bool:
+        kind, value = self.peek()
+        return kind == "ident" and value.upper() == word
+
+    @staticmethod
+    def _merge_kinds(a: str, b: str) -> str:
+        if "other" in (a, b):
+            return "other"
+        return "float" if "float" in (a, b) else "int"
+
+    # Boolean grammar: or_expr -> and_expr (OR and_expr)*
+    def or_expr(self):
+        out, kind = self.and_expr()
+        while self.at_keyword("OR"):
+            self.take()
+            rhs, _ = self.and_expr()
+            out, kind = f"({out} | {rhs})", "other"
+        return out, kind
+
+    def and_expr(self):
+        out, kind = self.not_expr()
+        while self.at_keyword("AND"):
+            self.take()
+            rhs, _ = self.not_expr()
+            out, kind = f"({out} & {rhs})", "other"
+        return out, kind
+
+    def not_expr(self):
+        if self.at_keyword("NOT"):
+            self.take()
+            out, _ = self.not_expr()
+            return f"(~{out})", "other"
+        return self.comparison()
+
+    def comparison(self):
+        left, lkind = self.add_expr()
+        kind, value = self.peek()
+        if kind == "op" and value in ("=", "<>", "!=", "<", ">", "<=", ">="):
+            self.take()
+            op = {"=": "==", "<>": "!="}.get(value, value)
+            right, _ = self.add_expr()
+            if op == "!=":
+                # SQL 'NULL <> x' is NULL (row not matched), but numpy
+                # NaN != x is True. 'x == x' is False/NA exactly on the
+                # nulls, so it doubles as a notna guard that holds for
+                # both numpy- and Arrow-backed columns.
+                return (f"(({left} != {right})"
+                        f" & ({left} == {left}) & ({right} == {right}))",
+                        "other")
+            return f"({left} {op} {right})", "other"
+        return left, lkind
+
+    # Arithmetic grammar: add_expr -> mul_expr ((+|-) mul_expr)*
+    def add_expr(self):
+        out, kind = self.mul_expr()
+        while self.peek() == ("op", "+") or self.peek() == ("op", "-"):
+            _, op = self.take()
+            rhs, rkind = self.mul_expr()
+            out, kind = f"({out} {op} {rhs})", self._merge_kinds(kind, rkind)
+        return out, kind
+
+    def mul_expr(self):
+        out, kind = self.unary()
+        while self.peek()[0] == "op" and self.peek()[1] in ("*", "/", "%"):
+            _, op = self.take()
+            rhs, rkind = self.unary()
+            if op == "/" and "float" not in (kind, rkind):
+                # SQLite truncates int / int; pandas eval does true
+                # division. Only translate when a float operand forces
+                # SQLite into true division as well.
+                raise ValueError("Integer division has SQLite semantics")
+            out, kind = f"({out} {op} {rhs})", self._merge_kinds(kind, rkind)
+        return out, kind
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            out, kind = self.unary()
+            return f"(-{out})", kind
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "str":
+            return repr(value[1:-1].replace("''", "'")), "other"
+        if kind == "num":
+            return value, "float" if any(c in value for c in ".eE") else "int"
+        if kind == "op" and value == "(":
+            out = self.or_expr()
+            self.expect_op(")")
+            return out
+        if kind == "ident":
+            name = value.strip("\"`[]")
+            if name not in self.columns:
+                raise ValueError(f"Unknown column: {name!r}")
+            dtype = self.dtypes[name]
+            if pd.api.types.is_float_dtype(dtype):
+                num_kind = "float"
+            elif pd.api.types.is_integer_dtype(dtype):
+                num_kind = "int"
+            else:
+                num_kind = "other"
+            return f"`{name}`", num_kind
+        raise ValueError(f"Unexpected token: {value!r}")
+
+    def column_name(self) -> str:
+        kind, value = self.take()
+        if kind != "ident":
+            raise ValueError(f"Expected column name, got {value!r}")
+        name = value.strip("\"`[]")
+        if name not in self.columns:
+            raise ValueError(f"Unknown column: {name!r}")
+        return name
+
+    def done(self) -> bool:
+        return self.pos == len(self.tokens)
+
+
+def _translate_update(sql: str, df: pd.DataFrame):
+    """Lift a simple UPDATE into pandas terms.
+
+    Returns (assignments, where) where assignments is a list of
+    (column, eval_expression) and where is an eval expression or None —
+    or returns None when the statement needs the SQLite path.
+    """
+    m = _UPDATE_SPLIT_RE.match(sql)
+    if not m:
+        return None
+    set_clause, where_clause = m.group(2), m.group(3)
+
+    try:
+        parser = _SqlExprTranslator(set_clause, df)
+        assignments = []
+        while True:
+            col = parser.column_name()
+            parser.expect_op("=")
+            expr, _ = parser.add_expr()
+            assignments.append((col, expr))
+            if parser.done():
+                break
+            parser.expect_op(",")
+
+        where = None
+        if where_clause is not None:
+            parser = _SqlExprTranslator(where_clause, df)
+            where, _ = parser.or_expr()
+            if not parser.done():
+                raise ValueError("Trailing tokens in WHERE clause")
+    except ValueError:
+        return None
+
+    return assignments, where
+
+
 def _handle_delete(sql: str) -> str:
     """Handle DELETE by executing in SQLite and rewriting sheet."""
-    m = re.match(r"DELETE\s+FROM\s+[\"']?(\w+)[\"']?", sql, re.IGNORECASE)
+    m = _DELETE_RE.match(sql)
     if not m:
         return "ERROR: Could not parse DELETE statement."
     
     table = m.group(1)
-    df = _frames.get(table)
+    df = _get_frame(table)
     if df is None:
         return f"ERROR: Sheet '{table}' not found."
 
-    import sqlite3
-    conn = sqlite3.connect(":memory:")
-    for name, frame in _frames.items():
-        frame.to_sql(name, conn, index=False, if_exists="replace")
-    
+    conn = _sqlite_conn(sql)
     cursor = conn.cursor()
     try:
+        cursor.execute("DROP TABLE IF EXISTS _before")
+        cursor.execute(f'CREATE TEMP TABLE _before AS SELECT rowid AS _rid FROM "{table}"')
         cursor.execute(sql)
         affected = cursor.rowcount
         conn.commit()
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return f"SQL ERROR: {e}"
-    
-    new_df = pd.read_sql(f'SELECT * FROM "{table}"', conn)
-    conn.close()
-    
+
+    # Drop only the deleted positions instead of re-reading the table
+    gone = pd.read_sql(f'SELECT _rid FROM _before EXCEPT SELECT rowid FROM "{table}"', conn)
+    new_df = df.drop(index=(gone["_rid"] - 1)).reset_index(drop=True)
+
+    # The surviving SQLite rowids now have holes, so the rowid/position
+    # mapping is stale — force a re-push on next exec; the DuckDB view
+    # still points at the replaced frame, so drop it too
+    _synced.pop(table, None)
+    _registered.pop(table, None)
+
     # Rewrite entire sheet
     _rewrite_sheet(table, new_df)
     _frames[table] = new_df
-    
+    _cache_frame(table, new_df)
+
     return f"Deleted {affected} row(s) from '{table}'."
 
 
@@ -305,62 +827,185 @@ def _handle_delete(sql: str) -> str:
 # Excel write helpers
 # ---------------------------------------------------------------------------
 
+@contextmanager
+def _excel_batch(wb):
+    """Pause Excel screen updates, recalculation and events for a batch of
+    reads/writes, restoring the previous settings afterwards.
+
+    Without this, every range assignment triggers a recalc + repaint +
+    event chain in Excel, which dominates the cost of bulk writes.
+    """
+    if wb is None:
+        yield
+        return
+
+    app = wb.app
+    prev_screen = app.screen_updating
+    prev_calc = app.calculation
+    app.screen_updating = False
+    app.calculation = "manual"
+    prev_events = None
+    try:
+        # COM only — not available through the AppleScript bridge
+        prev_events = app.api.EnableEvents
+        app.api.EnableEvents = False
+    except Exception:
+        pass
+    try:
+        yield
+    finally:
+        app.screen_updating = prev_screen
+        app.calculation = prev_calc
+        if prev_events is not None:
+            try:
+                app.api.EnableEvents = prev_events
+            except Exception:
+                pass
+
+
 def _diff_and_write(sheet_name: str, old_df: pd.DataFrame, new_df: pd.DataFrame) -> int:
-    """Write only changed cells back to Excel. Returns number of cells written."""
+    """Write only changed cells back to Excel. Returns number of cells written.
+
+    Changed cells are grouped into rectangular blocks and each block is
+    written with a single range assignment — one COM round-trip per block
+    instead of one per cell.
+    """
     if _wb is None:
         return 0
-    
+
     sheet = _wb.sheets[sheet_name]
-    changes = 0
-    
-    for i in range(min(len(old_df), len(new_df))):
-        for j, col in enumerate(new_df.columns):
-            old_val = old_df.iloc[i, j] if j < len(old_df.columns) else None
-            new_val = new_df.iloc[i, j]
-            if not _values_equal(old_val, new_val):
-                # +1 for header row, +1 for 1-indexed
-                sheet.range((i + 2, j + 1)).value = new_val
-                changes += 1
-    
-    return changes
+
+    # Find all changed cell coordinates first, then flush in blocks.
+    # The comparison runs as numpy array ops (one C-level pass per column)
+    # instead of a per-cell Python loop.
+    n_rows = min(len(old_df), len(new_df))
+    old_al = old_df.reindex(columns=new_df.columns).iloc[:n_rows]
+    new_al = new_df.iloc[:n_rows]
+    b = new_al.to_numpy()
+    mask = np.zeros(b.shape, dtype=bool)
+    for j in range(b.shape[1]):
+        xs, ys = old_al.iloc[:, j], new_al.iloc[:, j]
+        if (_neq_nan is not None
+                and pd.api.types.is_numeric_dtype(xs)
+                and pd.api.types.is_numeric_dtype(ys)):
+            # Numeric columns (dispatched on the column dtype — the 2D
+            # to_numpy() is object for Arrow-backed frames): run the
+            # JIT'd ufunc on float64 views, parallel across cores
+            mask[:, j] = _neq_nan(xs.to_numpy(dtype="float64", na_value=np.nan),
+                                  ys.to_numpy(dtype="float64", na_value=np.nan))
+            continue
+        x, y = xs.to_numpy(), ys.to_numpy()
+        try:
+            mask[:, j] = (x != y) & ~(pd.isna(x) & pd.isna(y))
+        except (TypeError, ValueError):
+            # Mixed object dtypes can break elementwise compare; fall back
+            # to the per-cell comparison for just this column.
+            mask[:, j] = [not _values_equal(u, v) for u, v in zip(x, y)]
+    changed = {(int(i), int(j)) for i, j in np.argwhere(mask)}
+
+    with _excel_batch(_wb):
+        for (r0, c0), (r1, c1) in _change_blocks(changed):
+            # Slice the numpy array instead of going through .iloc per cell
+            block = [[_to_excel(v) for v in row]
+                     for row in b[r0:r1 + 1, c0:c1 + 1]]
+            # +2 for header row + 1-indexing, +1 for 1-indexed columns
+            sheet.range((r0 + 2, c0 + 1), (r1 + 2, c1 + 1)).value = block
+
+    return len(changed)
+
+
+def _change_blocks(changed: set) -> list:
+    """Group changed (row, col) coordinates into rectangular blocks.
+
+    Finds vertical runs per column, then merges adjacent columns whose runs
+    cover the same rows — so a single-column UPDATE over contiguous rows
+    becomes exactly one block.
+    """
+    runs = []  # (col, top_row, bottom_row)
+    for j in sorted({c for _, c in changed}):
+        rows = sorted(i for i, c in changed if c == j)
+        start = prev = rows[0]
+        for i in rows[1:]:
+            if i != prev + 1:
+                runs.append((j, start, prev))
+                start = i
+            prev = i
+        runs.append((j, start, prev))
+
+    blocks = []  # [top_row, left_col, bottom_row, right_col]
+    for col, top, bottom in sorted(runs):
+        if blocks and blocks[-1][3] == col - 1 and blocks[-1][0] == top and blocks[-1][2] == bottom:
+            blocks[-1][3] = col
+        else:
+            blocks.append([top, col, bottom, col])
+
+    return [((r0, c0), (r1, c1)) for r0, c0, r1, c1 in blocks]
+
+
+def _to_excel(value):
+    """Convert a DataFrame value to what Excel should see (NaN -> blank)."""
+    return None if pd.isna(value) else value
 
 
 def _append_rows(sheet_name: str, old_df: pd.DataFrame, new_df: pd.DataFrame):
-    """Append new rows to the Excel sheet."""
+    """Append new rows to the Excel sheet in one block write."""
     if _wb is None:
         return
-    
+
+    added = new_df.iloc[len(old_df):]
+    if added.empty:
+        return
+
     sheet = _wb.sheets[sheet_name]
     start_row = len(old_df) + 2  # +1 header, +1 for 1-indexed
-    
-    for i in range(len(old_df), len(new_df)):
-        for j, col in enumerate(new_df.columns):
-            sheet.range((start_row + (i - len(old_df)), j + 1)).value = new_df.iloc[i, j]
+    # NaN/NA -> None so Excel gets blank cells instead of the text "nan".
+    # Go through object dtype first: Arrow-backed columns can't hold None,
+    # so .where() on them would leave NA in the payload.
+    payload = added.astype(object).where(pd.notna(added), None).values.tolist()
+    end_row = start_row + len(added) - 1
+    with _excel_batch(_wb):
+        sheet.range((start_row, 1), (end_row, len(new_df.columns))).value = payload
 
 
 def _rewrite_sheet(sheet_name: str, new_df: pd.DataFrame):
-    """Clear and rewrite an entire sheet (for DELETE operations)."""
+    """Rewrite an entire sheet (for DELETE operations).
+
+    Header and data go out as one block assignment; only the region the
+    new payload doesn't cover is cleared, instead of clearing the whole
+    used range and repopulating it cell by cell.
+    """
     if _wb is None:
         return
-    
+
     sheet = _wb.sheets[sheet_name]
-    sheet.used_range.clear_contents()
-    
-    # Write header
-    for j, col in enumerate(new_df.columns):
-        sheet.range((1, j + 1)).value = col
-    
-    # Write data
+    last = sheet.used_range.last_cell
+    old_last_row, old_last_col = last.row, last.column
+
+    payload = [list(new_df.columns)]
     if not new_df.empty:
-        sheet.range((2, 1)).value = new_df.values.tolist()
+        # Via object dtype so NA becomes None even on Arrow-backed columns
+        payload += new_df.astype(object).where(pd.notna(new_df), None).values.tolist()
+
+    n_cols = max(len(new_df.columns), 1)
+    with _excel_batch(_wb):
+        sheet.range((1, 1), (len(payload), n_cols)).value = payload
+
+        # Clear trailing rows / columns left over from the old contents
+        if old_last_row > len(payload):
+            sheet.range((len(payload) + 1, 1), (old_last_row, old_last_col)).clear_contents()
+        if old_last_col > n_cols:
+            sheet.range((1, n_cols + 1), (len(payload), old_last_col)).clear_contents()
 
 
 def _values_equal(a, b) -> bool:
-    """Compare two values, handling NaN."""
-    if pd.isna(a) and pd.isna(b):
-        return True
+    """Compare two values, handling NaN/NA."""
+    if pd.isna(a):
+        return bool(pd.isna(b))
+    if pd.isna(b):
+        return False
     try:
-        return a == b
+        # bool() guards against comparisons that return NA-ish objects
+        return bool(a == b)
     except (TypeError, ValueError):
         return str(a) == str(b)
 
@@ -369,22 +1014,216 @@ def _values_equal(a, b) -> bool:
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _ensure_loaded():
-    """Auto-reload if frames are empty (fresh CLI invocation)."""
-    global _frames
-    if not _frames:
-        state = _load_state()
-        wb_name = state.get("workbook")
-        if wb_name and xw is not None:
-            try:
-                attach(wb_name)
-            except Exception:
-                pass
+def _ensure_loaded(write: bool = False):
+    """Restore state on a fresh CLI invocation.
+
+    Read-only commands are served from the Parquet cache when the workbook
+    file on disk is unchanged; write commands always re-attach so the live
+    workbook is available for write-back. The cache tracks the saved file,
+    so unsaved in-Excel edits are only picked up by a real attach/reload.
+    """
+    if _frames:
+        # Frames may have come from the cache with no live workbook; a
+        # write command still needs Excel for the write-back
+        if write and _wb is None:
+            _reattach_from_state()
+        return
+    state = _load_state()
+    wb_name = state.get("workbook")
+    if not wb_name:
+        return
+    if not write and _load_cached_frames(state):
+        return
+    if xw is not None:
+        try:
+            attach(wb_name, header_row=state.get("header_row", DEFAULT_HEADER_ROW))
+        except Exception:
+            pass
+
+
+def _reattach_from_state() -> bool:
+    """Attach to the workbook recorded in the state file, preserving any
+    frames already restored from the Parquet cache.
+
+    Used when a cache-served process turns out to need the live workbook
+    after all — an uncached sheet, or a write command. The cached frames
+    were validated against the workbook file's mtime when they were
+    loaded, so they stay usable alongside the fresh attach.
+    """
+    state = _load_state()
+    wb_name = state.get("workbook")
+    if xw is None or not wb_name:
+        return False
+    cached = {k: v for k, v in _frames.items() if v is not None}
+    attach(wb_name, header_row=state.get("header_row", DEFAULT_HEADER_ROW))
+    if _wb is None:
+        return False
+    _frames.update({k: v for k, v in cached.items() if k in _frames})
+    return True
+
 
+def _ensure_names_loaded():
+    """Restore just the sheet names on a fresh CLI invocation.
 
-def _build_env() -> dict:
-    """Build environment dict for pandasql (sheet_name -> DataFrame)."""
-    return dict(_frames)
+    Enough for name-level commands like `sheets` — no Excel attach and no
+    data read. Prefers the Parquet cache (so row counts show up when it's
+    warm) and otherwise falls back to the sheet list in the state file.
+    """
+    global _header_row
+    if _frames:
+        return
+    state = _load_state()
+    if not state.get("workbook"):
+        return
+    if _load_cached_frames(state):
+        return
+    _header_row = state.get("header_row", DEFAULT_HEADER_ROW)
+    for name in state.get("sheets") or []:
+        _frames[name] = None
+
+
+def _cache_file(wb_name: str, sheet_name: str) -> Path:
+    """Path of the Parquet cache file for one sheet."""
+    safe_wb = re.sub(r"[^\w.-]", "_", wb_name)
+    safe_sheet = re.sub(r"[^\w.-]", "_", sheet_name)
+    return CACHE_DIR / safe_wb / f"{safe_sheet}.parquet"
+
+
+def _cache_frame(name: str, df: pd.DataFrame):
+    """Best-effort write of a frame to the on-disk Parquet cache."""
+    wb_name = _wb.name if _wb is not None else _load_state().get("workbook")
+    if not wb_name:
+        return
+    target = _cache_file(wb_name, name)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(target)
+    except Exception:
+        # Never fail a command over the cache; drop it so it can't go stale
+        target.unlink(missing_ok=True)
+
+
+def _load_cached_frames(state: dict) -> bool:
+    """Populate _frames from the Parquet cache if the workbook file on disk
+    hasn't changed since the state was saved."""
+    path, mtime = state.get("path"), state.get("mtime")
+    if not path or mtime is None:
+        return False
+    try:
+        if os.path.getmtime(path) != mtime:
+            return False
+    except OSError:
+        return False
+
+    loaded = {}
+    any_cached = False
+    for name in state.get("sheets") or []:
+        f = _cache_file(state["workbook"], name)
+        try:
+            loaded[name] = pd.read_parquet(f) if f.exists() else None
+        except Exception:
+            loaded[name] = None
+        if loaded[name] is not None:
+            any_cached = True
+    if not any_cached:
+        return False
+
+    global _header_row
+    _frames.update(loaded)
+    _header_row = state.get("header_row", DEFAULT_HEADER_ROW)
+    return True
+
+
+def _reset_sessions():
+    """Drop the shared SQL sessions (called on a fresh attach)."""
+    global _conn, _duck
+    if _conn is not None:
+        _conn.close()
+    _conn = None
+    _synced.clear()
+    if _duck is not None:
+        _duck.close()
+    _duck = None
+    _registered.clear()
+
+
+def _referenced_tables(sql: str) -> set:
+    """Sheet names a statement actually references.
+
+    A lightweight scan for identifiers after FROM/JOIN/INTO/UPDATE —
+    good enough to restrict ingest to the touched tables. Anything it
+    can't resolve just means the caller falls back to syncing everything.
+    """
+    refs = set()
+    for m in _TABLE_REF_RE.finditer(sql):
+        refs.add(m.group(1) or m.group(2))
+        # Comma-separated FROM lists: keep consuming
+        # "[alias], next_table" items after the first match
+        pos = m.end()
+        while True:
+            item = _TABLE_REF_CONT_RE.match(sql, pos)
+            if not item:
+                break
+            refs.add(item.group(1) or item.group(2))
+            pos = item.end()
+    return {name for name in refs if name in _frames}
+
+
+def _session_tables(sql: str | None) -> list:
+    """Tables to sync for a statement: the referenced ones, or all of them
+    when the statement can't be narrowed."""
+    names = _referenced_tables(sql) if sql else set()
+    if not names:
+        _load_all_frames()
+        names = set(_frames)
+    return sorted(names)
+
+
+def _sqlite_conn(sql: str | None = None) -> sqlite3.Connection:
+    """Return the shared in-memory SQLite session for exec paths.
+
+    Only the tables the statement references are pushed, and only when
+    their DataFrame was replaced since the last sync, so exec cost is
+    proportional to the touched table rather than the whole workbook.
+    """
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(":memory:")
+        _synced.clear()
+    for name in _session_tables(sql):
+        frame = _get_frame(name)
+        if frame is None:
+            continue
+        if _synced.get(name) != id(frame):
+            # method="multi" packs many rows per INSERT instead of one
+            # statement per row; cap the chunk so rows * cols stays under
+            # the bound-variable limit
+            chunk = max(1, _SQLITE_MAX_VARS // max(1, len(frame.columns)))
+            frame.to_sql(name, _conn, index=False, if_exists="replace",
+                         method="multi", chunksize=chunk)
+            _synced[name] = id(frame)
+    return _conn
+
+
+def _duck_conn(sql: str | None = None) -> "duckdb.DuckDBPyConnection":
+    """Return the shared DuckDB session with the referenced sheets
+    registered as views.
+
+    DuckDB scans the registered DataFrames' buffers directly — no per-call
+    copy into a database, unlike the old pandasql/SQLite path.
+    """
+    global _duck
+    if _duck is None:
+        _duck = duckdb.connect()
+        _registered.clear()
+    for name in _session_tables(sql):
+        frame = _get_frame(name)
+        if frame is None:
+            continue
+        if _registered.get(name) != id(frame):
+            _duck.register(name, frame)
+            _registered[name] = id(frame)
+    return _duck
 
 
 # ---------------------------------------------------------------------------